@@ -1,7 +1,30 @@
 import unittest
+import io
 import json
+import os
+import tempfile
+import threading
+from unittest import mock
 from os import environ
-from what3words import Geocoder, Coordinates, BoundingBox
+
+import requests
+from what3words import Geocoder, Coordinates, BoundingBox, ColumnarResults
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
 
 # Setup environment variables for API key and addresses
 api_key = environ.get("W3W_API_KEY", "test_api_key")
@@ -161,6 +184,113 @@ class TestGeocoder(unittest.TestCase):
             f"Expected suggestions for '{suggest}', but none were returned.",
         )
 
+    def test_autosuggest_multi(self):
+        # Test concurrent autosuggest across explicit languages
+        result = self.geocoder.autosuggest_multi(suggest, languages=["de", "en", "fr"])
+        if "error" in result:
+            self.assertEqual(
+                result["error"]["code"],
+                "QuotaExceeded",
+                "Expected QuotaExceeded error for multi-language Autosuggest",
+            )
+        else:
+            words = [suggestion["words"] for suggestion in result["suggestions"]]
+            self.assertGreater(len(words), 0)
+            self.assertEqual(len(words), len(set(words)), "Expected deduplicated suggestions")
+            self.assertEqual(
+                [suggestion["rank"] for suggestion in result["suggestions"]],
+                list(range(1, len(words) + 1)),
+            )
+
+    def test_autosuggest_multi_language_error(self):
+        # Test a language whose request fails is skipped and the others are still merged
+        def autosuggest(input, language, **kwargs):
+            if language == "de":
+                raise requests.exceptions.ConnectionError("connection reset")
+            return {"suggestions": [{"words": f"{language}.words.here", "rank": 1}]}
+
+        with mock.patch.object(self.geocoder, "autosuggest", side_effect=autosuggest):
+            result = self.geocoder.autosuggest_multi("index.home", languages=["en", "de", "fr"])
+        self.assertEqual(
+            [suggestion["words"] for suggestion in result["suggestions"]],
+            ["en.words.here", "fr.words.here"],
+        )
+
+        # When every language fails, the failure is raised like autosuggest does
+        with mock.patch.object(
+            self.geocoder,
+            "autosuggest",
+            side_effect=requests.exceptions.ConnectionError("connection reset"),
+        ):
+            with self.assertRaises(requests.exceptions.ConnectionError):
+                self.geocoder.autosuggest_multi("index.home", languages=["en", "de"])
+
+        # Programming errors are never turned into error responses
+        with mock.patch.object(self.geocoder, "autosuggest", side_effect=TypeError("bad")):
+            with self.assertRaises(TypeError):
+                self.geocoder.autosuggest_multi("index.home", languages=["en", "de"])
+
+    def test_autosuggest_multi_rejects_language(self):
+        with self.assertRaises(TypeError):
+            self.geocoder.autosuggest_multi("index.home.raft", language="en")
+
+    def test_autosuggest_multi_serbian_cyrillic_first(self):
+        # Test letters only used in Serbian-style Cyrillic put oo_cy first
+        with mock.patch.object(
+            self.geocoder, "autosuggest", return_value={"suggestions": []}
+        ) as autosuggest:
+            self.geocoder.autosuggest_multi("напомена.илузија.дирљи", max_workers=1)
+        self.assertEqual(autosuggest.call_args_list[0].kwargs["language"], "oo_cy")
+
+    def test_autosuggest_multi_prefers_input_prefix(self):
+        # Test a suggestion extending the input beats an earlier language's top guess
+        def autosuggest(input, language, **kwargs):
+            words = "other.guess.here" if language == "ru" else "index.home.raft"
+            return {"suggestions": [{"words": words, "rank": 1}]}
+
+        with mock.patch.object(self.geocoder, "autosuggest", side_effect=autosuggest):
+            result = self.geocoder.autosuggest_multi("index.home.r", languages=["ru", "en"])
+        self.assertEqual(
+            [suggestion["words"] for suggestion in result["suggestions"]],
+            ["index.home.raft", "other.guess.here"],
+        )
+
+    def test_autosuggest_multi_exact_match_cancels(self):
+        # Test queued languages are never called once an exact match arrives
+        called = []
+        release = threading.Event()
+
+        def autosuggest(input, language, **kwargs):
+            called.append(language)
+            if language == "de":
+                # Keep the single worker busy so "fr" is still queued
+                release.wait(5)
+            return {"suggestions": [{"words": "index.home.raft", "rank": 1}]}
+
+        with mock.patch.object(self.geocoder, "autosuggest", side_effect=autosuggest):
+            result = self.geocoder.autosuggest_multi(
+                "index.home.raft", languages=["en", "de", "fr"], max_workers=1
+            )
+            release.set()
+        self.assertEqual(result["suggestions"][0]["words"], "index.home.raft")
+        self.assertNotIn("fr", called)
+
+    def test_autosuggest_multi_detects_script(self):
+        # Test a Serbian Cyrillic input is tried in oo_cy first and ranked on the prefix
+        result = self.geocoder.autosuggest_multi("напомена.илузија.дирљи", n_results=3)
+        if "error" in result:
+            self.assertEqual(
+                result["error"]["code"],
+                "QuotaExceeded",
+                "Expected QuotaExceeded error for multi-language Autosuggest",
+            )
+        else:
+            self.assertGreater(len(result["suggestions"]), 0)
+            self.assertLessEqual(len(result["suggestions"]), 3)
+            first_suggestion = result["suggestions"][0]
+            self.assertEqual(first_suggestion["language"], "oo")
+            self.assertTrue(first_suggestion["words"].startswith("напомена.илузија.дирљи"))
+
     def test_grid_section(self):
         sw = Coordinates(52.208867, 0.117540)
         ne = Coordinates(52.207988, 0.116126)
@@ -178,6 +308,137 @@ class TestGeocoder(unittest.TestCase):
             self.assertIn("lines", result, "Expected 'lines' in the response")
             self.assertIsNotNone(result["lines"])
 
+    def test_iter_squares(self):
+        # Grid lines every 1 degree, from -1 to 4 in both directions
+        lines = [
+            {"start": {"lat": lat, "lng": -1.0}, "end": {"lat": lat, "lng": 4.0}}
+            for lat in range(-1, 5)
+        ] + [
+            {"start": {"lat": -1.0, "lng": lng}, "end": {"lat": 4.0, "lng": lng}}
+            for lng in range(-1, 5)
+        ]
+        bbox = BoundingBox(Coordinates(0.5, 0.5), Coordinates(1.5, 2.5))
+        with mock.patch.object(
+            self.geocoder, "grid_section", return_value={"lines": lines}
+        ) as grid_section:
+            squares = list(self.geocoder.iter_squares(bbox))
+
+        # The request is padded so the squares cut by the edges are complete
+        padded = grid_section.call_args[0][0]
+        self.assertLess(padded.sw.lat, bbox.sw.lat)
+        self.assertGreater(padded.ne.lng, bbox.ne.lng)
+        # Two rows (0-1, 1-2) by three columns (0-1, 1-2, 2-3), edges included
+        self.assertEqual(len(squares), 6)
+        self.assertEqual(squares[0], BoundingBox(Coordinates(0, 0), Coordinates(1, 1)))
+        self.assertEqual(squares[-1], BoundingBox(Coordinates(1, 2), Coordinates(2, 3)))
+
+        # A box lying on grid lines yields no squares outside it
+        with mock.patch.object(
+            self.geocoder, "grid_section", return_value={"lines": lines}
+        ):
+            on_lines = BoundingBox(Coordinates(0, 0), Coordinates(1, 2))
+            self.assertEqual(len(list(self.geocoder.iter_squares(on_lines))), 2)
+
+        # Resolve a couple of squares, passing one twice to check deduplication
+        with mock.patch.object(
+            self.geocoder, "convert_to_3wa", return_value={"words": addr}
+        ) as convert_to_3wa:
+            resolved = self.geocoder.resolve_squares([squares[0], squares[-1], squares[0]])
+        self.assertEqual([square for square, _ in resolved], [squares[0], squares[-1]])
+        self.assertEqual(convert_to_3wa.call_count, 2)
+
+    def test_iter_squares_segmented_columns(self):
+        # The vertical line at lng 1 only spans the lower row, as where the
+        # column spacing changes, so the upper row is a single wider square
+        lines = [
+            {"start": {"lat": lat, "lng": 0.0}, "end": {"lat": lat, "lng": 2.0}}
+            for lat in (0.0, 1.0, 2.0)
+        ] + [
+            {"start": {"lat": 0.0, "lng": 0.0}, "end": {"lat": 2.0, "lng": 0.0}},
+            {"start": {"lat": 1.0, "lng": 1.0}, "end": {"lat": 0.0, "lng": 1.0}},
+            {"start": {"lat": 0.0, "lng": 2.0}, "end": {"lat": 2.0, "lng": 2.0}},
+        ]
+        bbox = BoundingBox(Coordinates(0.5, 0.5), Coordinates(1.5, 1.5))
+        with mock.patch.object(
+            self.geocoder, "grid_section", return_value={"lines": lines}
+        ):
+            squares = list(self.geocoder.iter_squares(bbox))
+        self.assertEqual(
+            squares,
+            [
+                BoundingBox(Coordinates(0, 0), Coordinates(1, 1)),
+                BoundingBox(Coordinates(0, 1), Coordinates(1, 2)),
+                BoundingBox(Coordinates(1, 0), Coordinates(2, 2)),
+            ],
+        )
+
+    def test_iter_squares_error(self):
+        # Test a grid section error is raised rather than yielding nothing
+        error = {"error": {"code": "BadBoundingBox", "message": "Invalid bounding box"}}
+        with mock.patch.object(self.geocoder, "grid_section", return_value=error):
+            with self.assertRaises(ValueError):
+                list(self.geocoder.iter_squares(BoundingBox(Coordinates(0, 0), Coordinates(1, 1))))
+
+    def test_tracing(self):
+        # Test a span is emitted for every phase of a traced request
+        spans = []
+        geocoder = Geocoder(api_key=self.api_key, tracer=spans.append)
+        response = mock.Mock(status_code=200, text=json.dumps({"languages": [english]}))
+        with mock.patch("requests.get", return_value=response):
+            result = geocoder.available_languages()
+        self.assertEqual(result["languages"], [english])
+        self.assertEqual(
+            [span["name"] for span in spans],
+            [
+                "what3words.prepare_request",
+                "what3words.http",
+                "what3words.read_body",
+                "what3words.decode_json",
+                "what3words.request",
+            ],
+        )
+        root = spans[-1]
+        self.assertIsNone(root["parent_span_id"])
+        self.assertEqual(root["attributes"]["w3w.endpoint"], "/available-languages")
+        self.assertEqual(root["attributes"]["http.status_code"], 200)
+        for span in spans[:-1]:
+            self.assertEqual(span["trace_id"], root["trace_id"])
+            self.assertEqual(span["parent_span_id"], root["span_id"])
+        for span in spans:
+            self.assertGreaterEqual(span["end_time_unix_nano"], span["start_time_unix_nano"])
+
+        # Nothing is traced with a sample rate of zero
+        geocoder.trace_sample_rate = 0.0
+        with mock.patch("requests.get", return_value=response):
+            geocoder.available_languages()
+        self.assertEqual(len(spans), 5)
+
+    def test_tracer_errors_do_not_break_requests(self):
+        # Test a failing tracer neither replaces the result nor hides a request error
+        geocoder = Geocoder(api_key=self.api_key, tracer=mock.Mock(side_effect=KeyError))
+        response = mock.Mock(status_code=200, text=json.dumps({"languages": [english]}))
+        with mock.patch("requests.get", return_value=response):
+            with self.assertWarns(RuntimeWarning):
+                result = geocoder.available_languages()
+        self.assertEqual(result["languages"], [english])
+
+        with mock.patch("requests.get", side_effect=ConnectionError("unreachable")):
+            with self.assertWarns(RuntimeWarning):
+                with self.assertRaises(ConnectionError):
+                    geocoder.available_languages()
+
+    def test_profile(self):
+        # Test the profile block times requests and prints a breakdown
+        output = io.StringIO()
+        response = mock.Mock(status_code=200, text=json.dumps({"languages": [english]}))
+        with mock.patch("requests.get", return_value=response):
+            with self.geocoder.profile(file=output) as profile:
+                self.geocoder.available_languages()
+                self.geocoder.available_languages()
+        self.assertEqual(profile.stats()["request"]["calls"], 2)
+        self.assertEqual(profile.stats()["http"]["calls"], 2)
+        self.assertIn("decode_json", output.getvalue())
+
     def test_invalid_address(self):
         invalid_addr = "invalid.address"
         result = self.geocoder.convert_to_coordinates(invalid_addr)
@@ -268,8 +529,178 @@ class TestGeocoder(unittest.TestCase):
         invalid_input = "index.home"
         self.assertFalse(self.geocoder.did_you_mean(invalid_input))
 
+    def test_regex_array_helpers(self):
+        # Test the vectorised regex helpers, serially and across worker processes
+        texts = ["index.home.raft", "index.home", None, "at index.home.raft or filled.count.soap"]
+        for chunk_size, max_workers in ((100, 1), (1, 2)):
+            possible = self.geocoder.is_possible_3wa_array(
+                texts, chunk_size=chunk_size, max_workers=max_workers
+            )
+            self.assertEqual(list(possible), [True, False, False, False])
+            did_you_mean = self.geocoder.did_you_mean_array(
+                ["indx.home.rafe", "index.home"], chunk_size=chunk_size, max_workers=max_workers
+            )
+            self.assertEqual(list(did_you_mean), [True, False])
+            rows, matches = self.geocoder.find_possible_3wa_array(
+                texts, chunk_size=chunk_size, max_workers=max_workers
+            )
+            self.assertEqual(rows, [0, 3, 3])
+            self.assertEqual(
+                matches, ["index.home.raft", "index.home.raft", "filled.count.soap"]
+            )
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_regex_array_helpers_numpy(self):
+        # Test NumPy input returns NumPy arrays, and list input still returns lists
+        texts = numpy.array(["index.home.raft", "index.home"], dtype=object)
+        possible = self.geocoder.is_possible_3wa_array(texts)
+        self.assertIsInstance(possible, numpy.ndarray)
+        self.assertEqual(possible.tolist(), [True, False])
+        rows, matches = self.geocoder.find_possible_3wa_array(texts)
+        self.assertEqual(rows.tolist(), [0])
+        self.assertEqual(matches.tolist(), ["index.home.raft"])
+        self.assertEqual(self.geocoder.is_possible_3wa_array(list(texts)), [True, False])
+
+    @unittest.skipIf(pandas is None, "pandas is not installed")
+    def test_regex_array_helpers_pandas(self):
+        # Test Series input keeps the source labels and name, with missing values not matching
+        notes = pandas.Series(
+            ["index.home.raft", None, "at index.home.raft or filled.count.soap", pandas.NA],
+            index=["a", "b", "c", "d"],
+            name="notes",
+            dtype=object,
+        )
+        possible = self.geocoder.is_possible_3wa_array(notes)
+        self.assertIsInstance(possible, pandas.Series)
+        self.assertEqual(possible.name, "notes")
+        self.assertEqual(possible.dtype, bool)
+        self.assertEqual(possible.to_dict(), {"a": True, "b": False, "c": False, "d": False})
+
+        did_you_mean = self.geocoder.did_you_mean_array(notes)
+        self.assertEqual(list(did_you_mean.index), ["a", "b", "c", "d"])
+        self.assertEqual(did_you_mean.tolist(), [True, False, False, False])
+
+        matches = self.geocoder.find_possible_3wa_array(notes)
+        self.assertIsInstance(matches, pandas.Series)
+        self.assertEqual(matches.name, "notes")
+        self.assertEqual(list(matches.index), ["a", "c", "c"])
+        self.assertEqual(
+            matches.tolist(), ["index.home.raft", "index.home.raft", "filled.count.soap"]
+        )
+
+
+class TestColumnarResults(unittest.TestCase):
+
+    response = {
+        "country": "GB",
+        "square": {
+            "southwest": {"lng": -0.125516, "lat": 51.508328},
+            "northeast": {"lng": -0.125473, "lat": 51.508355},
+        },
+        "nearestPlace": "Bayswater, London",
+        "coordinates": {"lng": -0.125499, "lat": 51.508341},
+        "words": addr,
+        "language": "en",
+    }
+    error = {"error": {"code": "BadCoordinates", "message": "latitude must be >=-90 and <= 90"}}
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_to_numpy(self):
+        columnar = ColumnarResults(chunk_size=2)
+        for response in (self.response, self.error, self.response):
+            columnar.append(response)
+        self.assertEqual(len(columnar), 3)
+        columns = columnar.to_numpy()
+        self.assertEqual(list(columns["words"]), [addr, None, addr])
+        self.assertEqual(list(columns["error"]), [None, "BadCoordinates", None])
+        self.assertEqual(columns["lat"][0], lat)
+        self.assertTrue(numpy.isnan(columns["lng"][1]))
+        self.assertEqual(columns["ne_lat"][2], 51.508355)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_on_chunk(self):
+        chunks = []
+        columnar = ColumnarResults(chunk_size=2, on_chunk=chunks.append)
+        for response in (self.response, self.error, self.response):
+            columnar.append(response)
+        self.assertEqual([len(chunk["words"]) for chunk in chunks], [2])
+        columnar.flush()
+        self.assertEqual([len(chunk["words"]) for chunk in chunks], [2, 1])
+        self.assertEqual(len(columnar.to_numpy()["words"]), 0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_resolve_squares_columnar(self):
+        # Test squares are read one window at a time and error rows keep their bounds
+        consumed = []
+
+        def squares():
+            for lat in range(6):
+                consumed.append(lat)
+                yield BoundingBox(Coordinates(lat, 0), Coordinates(lat + 1, 1))
+
+        seen_at_call = []
+
+        def convert_to_3wa(coordinates, language=None):
+            seen_at_call.append(len(consumed))
+            return self.error if coordinates.lat > 4 else self.response
+
+        geocoder = Geocoder(api_key=api_key)
+        with mock.patch.object(geocoder, "convert_to_3wa", side_effect=convert_to_3wa):
+            columnar = geocoder.resolve_squares(
+                squares(), columnar=ColumnarResults(chunk_size=2)
+            )
+        self.assertEqual(len(columnar), 6)
+        self.assertLessEqual(seen_at_call[0], 2)
+        columns = columnar.to_numpy()
+        self.assertEqual(columns["error"][5], "BadCoordinates")
+        self.assertEqual((columns["sw_lat"][5], columns["ne_lat"][5]), (5, 6))
+        self.assertEqual(columns["sw_lat"][0], 51.508328)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_resolve_squares_columnar_request_failure(self):
+        # Test a failed request becomes an error row instead of aborting the batch
+        def convert_to_3wa(coordinates, language=None):
+            if coordinates.lat == 2.5:
+                raise requests.exceptions.ConnectionError("connection reset")
+            return self.response
+
+        squares = [BoundingBox(Coordinates(lat, 0), Coordinates(lat + 1, 1)) for lat in range(5)]
+        chunks = []
+        geocoder = Geocoder(api_key=api_key)
+        with mock.patch.object(geocoder, "convert_to_3wa", side_effect=convert_to_3wa):
+            geocoder.resolve_squares(
+                squares, columnar=ColumnarResults(chunk_size=2, on_chunk=chunks.append)
+            )
+        errors = [error for chunk in chunks for error in chunk["error"]]
+        self.assertEqual(errors, [None, None, "ConnectionError", None, None])
+        self.assertEqual((chunks[1]["sw_lat"][0], chunks[1]["ne_lat"][0]), (2, 3))
+
+    @unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+    def test_arrow_output(self):
+        # Test Arrow chunks can be written to Parquet and read back
+        path = os.path.join(tempfile.mkdtemp(), "squares.parquet")
+        columnar = ColumnarResults(chunk_size=2, format="arrow")
+        writer = pyarrow.parquet.ParquetWriter(path, columnar.arrow_schema())
+        columnar.on_chunk = writer.write_batch
+        for response in (self.response, self.error, self.response):
+            columnar.append(response)
+        columnar.flush()
+        writer.close()
+
+        table = pyarrow.parquet.read_table(path)
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.schema, columnar.arrow_schema())
+        self.assertEqual(table.column("words").to_pylist(), [addr, None, addr])
+        self.assertEqual(table.column("lat").to_pylist()[0], lat)
+
+        # Without on_chunk every row is kept for to_arrow
+        kept = ColumnarResults(chunk_size=2)
+        for response in (self.response, self.error, self.response):
+            kept.append(response)
+        table = kept.to_arrow()
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.column("error").to_pylist(), [None, "BadCoordinates", None])
 
-    
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,8 @@ from .what3words import Geocoder  # noqa: F401
 from .what3words import Circle  # noqa: F401
 from .what3words import Coordinates  # noqa: F401
 from .what3words import BoundingBox  # noqa: F401
+from .what3words import ColumnarResults  # noqa: F401
+from .what3words import RequestProfile  # noqa: F401
 
 from .version import __version__ as v
 
@@ -2,13 +2,195 @@
 # coding: utf8
 
 import json
+import math
+import os
 import requests
 import platform
+import random
 import re
-from typing import List, Optional, Dict
+import sys
+import threading
+import time
+import unicodedata
+import warnings
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
+from itertools import islice, repeat
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    TextIO,
+)
 
 from .version import __version__
 
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:  # pragma: no cover
+    pd = None
+
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover
+    pa = None
+
+_POSSIBLE_3WA_PATTERN = re.compile(
+    r"^\/*(?:[^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}|[<.,>?\/\";:£§º©®\s]+[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+|[^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+([\u0020\u00A0][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+){1,3}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+([\u0020\u00A0][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+){1,3}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+([\u0020\u00A0][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+){1,3})$"
+)
+_FIND_3WA_PATTERN = re.compile(
+    r"[^\d`~!@#$%^&*()+\-=\[\]{}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^\d`~!@#$%^&*()+\-=\[\]{}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^\d`~!@#$%^&*()+\-=\[\]{}\\|'<>.,?\/\";:£§º©®\s]{1,}", re.UNICODE
+)
+_DID_YOU_MEAN_PATTERN = re.compile(
+    r"^\/?[^0-9`~!@#$%^&*()+\-=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.\uFF61\u3002\uFF65\u30FB\uFE12\u17D4\u0964\u1362\u3002:။^_۔։ ,\\\/+'&\\:;|\u3000-]{1,2}[^0-9`~!@#$%^&*()+\-=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.\uFF61\u3002\uFF65\u30FB\uFE12\u17D4\u0964\u1362\u3002:။^_۔։ ,\\\/+'&\\:;|\u3000-]{1,2}[^0-9`~!@#$%^&*()+\-=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}$"
+)
+# Number of texts handed to each worker process when max_workers > 1
+REGEX_CHUNK_SIZE = 100_000
+
+# Margin added around a bounding box so grid_section also returns the lines
+# closing the squares cut by its edges; a little over one 3m square
+_GRID_PADDING_METRES = 4
+_METRES_PER_DEGREE_LAT = 111_320
+
+
+def _covering(values: List[float], low: float, high: float) -> List[float]:
+    """
+    Trims sorted grid line positions to those bounding the squares that overlap [low, high].
+    :param values: Sorted line latitudes or longitudes
+    :param low: Lower edge of the area
+    :param high: Upper edge of the area
+    :return: The last line at or below low through the first line at or above high
+    """
+    start = max(bisect_right(values, low) - 1, 0)
+    return values[start : bisect_left(values, high) + 1]
+
+
+def _match_chunk(pattern: "re.Pattern", texts: List[Any]) -> List[bool]:
+    match = pattern.match
+    return [isinstance(text, str) and match(text) is not None for text in texts]
+
+
+def _findall_chunk(pattern: "re.Pattern", texts: List[Any]) -> List[List[str]]:
+    findall = pattern.findall
+    return [findall(text) if isinstance(text, str) else [] for text in texts]
+
+
+def _map_chunks(
+    func, pattern: "re.Pattern", texts: Any, chunk_size: int, max_workers: int
+) -> List[Any]:
+    """
+    Applies a chunk function to every text, optionally spreading large inputs over processes.
+    :param func: Module level chunk function (must be picklable)
+    :param pattern: Precompiled regex pattern
+    :param texts: Sequence, NumPy array or pandas Series of strings
+    :param chunk_size: Number of texts handed to each worker at a time
+    :param max_workers: Number of worker processes; 1 matches in the calling process
+    :return: One result per text, in input order
+    """
+    values = texts.tolist() if hasattr(texts, "tolist") else list(texts)
+    if max_workers <= 1 or len(values) <= chunk_size:
+        return func(pattern, values)
+    chunks = [values[i : i + chunk_size] for i in range(0, len(values), chunk_size)]
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        results = executor.map(func, repeat(pattern), chunks)
+        return [result for chunk in results for result in chunk]
+
+
+def _to_mask(texts: Any, values: List[bool]) -> Any:
+    if pd is not None and isinstance(texts, pd.Series):
+        return pd.Series(values, index=texts.index, name=texts.name, dtype=bool)
+    if np is not None and isinstance(texts, np.ndarray):
+        return np.array(values, dtype=bool)
+    return values
+
+
+def _to_exploded(texts: Any, matches: List[List[str]]) -> Any:
+    rows = [row for row, found in enumerate(matches) for _ in found]
+    flat = [match for found in matches for match in found]
+    if pd is not None and isinstance(texts, pd.Series):
+        return pd.Series(flat, index=texts.index[rows], name=texts.name, dtype=object)
+    if np is not None and isinstance(texts, np.ndarray):
+        return np.array(rows, dtype=np.intp), np.array(flat, dtype=object)
+    return rows, flat
+
+
+# Candidate 3 word address languages for each Unicode script, used by autosuggest_multi
+_SCRIPT_LANGUAGES = {
+    # Latin script is shared by most languages; only the most widely used are tried
+    "LATIN": ["en", "es", "fr", "de", "pt", "it", "nl", "tr"],
+    "CYRILLIC": ["ru", "uk", "bg", "kk", "mn", "oo_cy"],
+    "ARABIC": ["ar", "fa", "ur"],
+    "DEVANAGARI": ["hi", "mr", "ne"],
+    "BENGALI": ["bn"],
+    "GUJARATI": ["gu"],
+    "GURMUKHI": ["pa"],
+    "KANNADA": ["kn"],
+    "MALAYALAM": ["ml"],
+    "ORIYA": ["or"],
+    "TAMIL": ["ta"],
+    "TELUGU": ["te"],
+    "SINHALA": ["si"],
+    "THAI": ["th"],
+    "LAO": ["lo"],
+    "KHMER": ["km"],
+    "ETHIOPIC": ["am", "ti"],
+    "GREEK": ["el"],
+    "HEBREW": ["he"],
+    "HANGUL": ["ko"],
+    "HIRAGANA": ["ja"],
+    "KATAKANA": ["ja"],
+    "CJK": ["zh", "ja"],
+}
+
+_SERBIAN_CYRILLIC = set("јљњћђџЈЉЊЋЂЏ")
+
+
+def _script_languages(text: str, preferred: str) -> List[str]:
+    """
+    Guesses candidate languages from the Unicode script of the input characters.
+    :param text: The full or partial 3 word address
+    :param preferred: Language tried first if it is written in the same script
+    :return: Candidate languages, or just the preferred one if the script is not recognised
+    """
+    scripts = []
+    for char in text:
+        if char.isalpha():
+            script = unicodedata.name(char, "").split(" ")[0]
+            if script in _SCRIPT_LANGUAGES and script not in scripts:
+                scripts.append(script)
+    # Kana only occurs in Japanese, even when mixed with CJK ideographs
+    if "HIRAGANA" in scripts or "KATAKANA" in scripts:
+        scripts = ["HIRAGANA"]
+    if not scripts:
+        return [preferred]
+
+    languages = list(_SCRIPT_LANGUAGES[scripts[0]])
+    if preferred in languages:
+        languages.remove(preferred)
+        languages.insert(0, preferred)
+    elif scripts[0] == "LATIN" and not any(
+        preferred in candidates for candidates in _SCRIPT_LANGUAGES.values()
+    ):
+        # Latin languages outside the shortlist are not listed under any script
+        languages.insert(0, preferred)
+    if scripts[0] == "CYRILLIC" and any(char in _SERBIAN_CYRILLIC for char in text):
+        # These letters are only used in Serbian-style Cyrillic
+        languages.remove("oo_cy")
+        languages.insert(0, "oo_cy")
+    return languages
+
 
 class Geocoder:
     """
@@ -20,16 +202,23 @@ class Geocoder:
         api_key: str,
         language: str = "en",
         end_point: str = "https://api.what3words.com/v3",
+        tracer: Optional[Callable[[Dict], None]] = None,
+        trace_sample_rate: float = 1.0,
     ):
         """
         Constructor
         :param api_key: A valid API key
         :param language: Default language used with the Geocoder
         :param end_point: What3Words API endpoint
+        :param tracer: Called with a span dictionary for each phase of every traced request
+        :param trace_sample_rate: Fraction of requests traced when a tracer is set, from 0.0 to 1.0
         """
         self.end_point = end_point
         self.api_key = api_key
         self.language = language
+        self.tracer = tracer
+        self.trace_sample_rate = trace_sample_rate
+        self._profiles = []
 
     def convert_to_coordinates(
         self, words: str, format: str = "json", locale: Optional[str] = None
@@ -94,6 +283,102 @@ class Geocoder:
             return {"error": response["error"]}
         return response
 
+    def iter_squares(self, bounding_box: "BoundingBox") -> Iterator["BoundingBox"]:
+        """
+        Lazily yields every 3m square overlapping a bounding box, south to north and west to east.
+        Square bounds are derived locally from the lines of a single grid_section call, made
+        for the box padded by about one square so squares cut by its edges are complete.
+        :param bounding_box: BoundingBox object
+        :return: Generator of BoundingBox objects, one per square
+        :raises ValueError: If the grid section request returns an error
+        """
+        sw, ne = bounding_box.sw, bounding_box.ne
+        pad_lat = _GRID_PADDING_METRES / _METRES_PER_DEGREE_LAT
+        pad_lng = pad_lat / max(
+            math.cos(math.radians(max(abs(sw.lat), abs(ne.lat)))), 0.01
+        )
+        padded = BoundingBox(
+            Coordinates(sw.lat - pad_lat, sw.lng - pad_lng),
+            Coordinates(ne.lat + pad_lat, ne.lng + pad_lng),
+        )
+        response = self.grid_section(padded)
+        if "error" in response:
+            raise ValueError(
+                f"{response['error']['code']}: {response['error']['message']}"
+            )
+        lats, columns = set(), []
+        for line in response["lines"]:
+            start, end = line["start"], line["end"]
+            if start["lat"] == end["lat"]:
+                lats.add(start["lat"])
+            else:
+                south, north = sorted((start["lat"], end["lat"]))
+                columns.append((start["lng"], south, north))
+        lats = _covering(sorted(lats), sw.lat, ne.lat)
+        for south, north in zip(lats, lats[1:]):
+            # Vertical lines can be split where the column spacing changes, so each
+            # row only uses the segments spanning it
+            lngs = sorted(
+                {lng for lng, bottom, top in columns if bottom <= south and top >= north}
+            )
+            lngs = _covering(lngs, sw.lng, ne.lng)
+            for west, east in zip(lngs, lngs[1:]):
+                yield BoundingBox(Coordinates(south, west), Coordinates(north, east))
+
+    def resolve_squares(
+        self,
+        squares: Iterable["BoundingBox"],
+        language: Optional[str] = None,
+        max_workers: int = 8,
+        columnar: Optional["ColumnarResults"] = None,
+    ) -> Any:
+        """
+        Fetches the 3 word address of each square concurrently, skipping duplicate squares.
+        :param squares: BoundingBox objects, e.g. a filtered subset of iter_squares
+        :param language: A supported 3 word address language as an ISO 639-1 2 letter code. Defaults to self.language
+        :param max_workers: Maximum number of concurrent requests
+        :param columnar: ColumnarResults to append responses to instead of returning pairs.
+            Squares are then read and resolved one chunk_size window at a time, so only the
+            bounds of the distinct squares seen so far are kept besides the current window.
+            A square whose request fails on the network becomes an error row
+        :return: List of (square, convert_to_3wa response) pairs in first-seen order,
+            or the flushed ColumnarResults when columnar is given
+        """
+
+        def unique() -> Iterator["BoundingBox"]:
+            seen = set()
+            for square in squares:
+                key = (square.sw.lat, square.sw.lng, square.ne.lat, square.ne.lng)
+                if key not in seen:
+                    seen.add(key)
+                    yield square
+
+        def resolve(square: "BoundingBox") -> Dict:
+            center = Coordinates(
+                (square.sw.lat + square.ne.lat) / 2, (square.sw.lng + square.ne.lng) / 2
+            )
+            return self.convert_to_3wa(center, language=language)
+
+        def resolve_row(square: "BoundingBox") -> Dict:
+            try:
+                return resolve(square)
+            except requests.RequestException as error:
+                # One failed request must not abort a batch; it becomes an error row
+                return {"error": {"code": type(error).__name__, "message": str(error)}}
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            if columnar is None:
+                distinct = list(unique())
+                return list(zip(distinct, executor.map(resolve, distinct)))
+            pending = unique()
+            window = list(islice(pending, columnar.chunk_size))
+            while window:
+                for square, response in zip(window, executor.map(resolve_row, window)):
+                    columnar.append(response, square)
+                window = list(islice(pending, columnar.chunk_size))
+        columnar.flush()
+        return columnar
+
     def available_languages(self) -> Dict:
         """
         Retrieve a list of available 3 word languages.
@@ -167,6 +452,85 @@ class Geocoder:
             return {"error": response["error"]}
         return response
 
+    def autosuggest_multi(
+        self,
+        input: str,
+        languages: Optional[List[str]] = None,
+        max_workers: int = 4,
+        **kwargs,
+    ) -> Dict:
+        """
+        Runs autosuggest concurrently in several languages and merges the suggestions.
+        Calls not yet sent are cancelled as soon as one language returns an exact match.
+        A language whose request fails on the network is skipped; if all of them fail,
+        the first failure is raised, as autosuggest would.
+        :param input: The full or partial 3 word address to obtain suggestions for
+        :param languages: Candidate languages as ISO 639-1 2 letter codes, in order of
+            preference. Defaults to common languages written in the script of the input,
+            with self.language first, falling back to self.language
+        :param max_workers: Maximum number of concurrent requests
+        :param kwargs: Any other autosuggest parameter except language, e.g. n_results or focus
+        :return: Response as a dictionary, with suggestions deduplicated and ranked across languages
+        """
+        if "language" in kwargs:
+            raise TypeError("autosuggest_multi() takes languages, not language")
+        if not languages:
+            languages = _script_languages(input, self.language)
+        words = input.lstrip("/")
+
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+        futures = {}
+        responses = {}
+        failures = []
+        try:
+            for language in languages:
+                future = executor.submit(self.autosuggest, input, language=language, **kwargs)
+                futures[future] = language
+            for future in as_completed(futures):
+                try:
+                    response = future.result()
+                except requests.RequestException as error:
+                    failures.append(error)
+                    continue
+                responses[futures[future]] = response
+                if any(
+                    suggestion["words"] == words
+                    for suggestion in response.get("suggestions", [])
+                ):
+                    break
+        finally:
+            # Executor.shutdown(cancel_futures=True) needs Python 3.9
+            for future in futures:
+                future.cancel()
+            executor.shutdown(wait=False)
+        if not responses and failures:
+            raise failures[0]
+
+        best = {}
+        for order, language in enumerate(languages):
+            for suggestion in responses.get(language, {}).get("suggestions", []):
+                # Exact matches first, then suggestions extending the input, then by
+                # per-language rank and finally by language order
+                key = (
+                    suggestion["words"] != words,
+                    not suggestion["words"].startswith(words),
+                    suggestion.get("rank", 0),
+                    order,
+                )
+                current = best.get(suggestion["words"])
+                if current is None or key < current[0]:
+                    best[suggestion["words"]] = (key, suggestion)
+        errors = [r["error"] for r in responses.values() if "error" in r]
+        if not best and errors and len(errors) == len(responses):
+            return {"error": errors[0]}
+
+        merged = [item[1] for item in sorted(best.values(), key=lambda item: item[0])]
+        if kwargs.get("n_results"):
+            merged = merged[: kwargs["n_results"]]
+        for rank, suggestion in enumerate(merged, start=1):
+            suggestion["rank"] = rank
+        return {"suggestions": merged}
+
     def default_language(self, lang: Optional[str] = None) -> str:
         """
         Sets/returns default language
@@ -194,16 +558,68 @@ class Geocoder:
         :param params: Parameters
         :return: Response as a dictionary
         """
-        if params is None:
-            params = {}
+        trace = self._start_trace(url_path)
+        try:
+            if params is None:
+                params = {}
 
-        params["key"] = self.api_key
-        url = self.end_point + url_path
-        headers = {
-            "X-W3W-Wrapper": f"what3words-Python/{__version__} (Python {platform.python_version()}; {platform.platform()})"
-        }
-        response = requests.get(url, params=params, headers=headers).text
-        return json.loads(response)
+            params["key"] = self.api_key
+            url = self.end_point + url_path
+            headers = {
+                "X-W3W-Wrapper": f"what3words-Python/{__version__} (Python {platform.python_version()}; {platform.platform()})"
+            }
+            # Streaming returns once the headers arrive, splitting the wait from the download
+            trace.mark("http")
+            response = requests.get(url, params=params, headers=headers, stream=True)
+            trace.set_attribute("http.status_code", response.status_code)
+            trace.mark("read_body")
+            text = response.text
+            trace.mark("decode_json")
+            return json.loads(text)
+        except Exception as error:
+            trace.set_attribute("error.type", type(error).__name__)
+            raise
+        finally:
+            trace.end()
+
+    def _start_trace(self, url_path: str) -> "_RequestTrace":
+        """
+        Decides whether a request is traced, by sampling or an active profile block
+        :param url_path: API method URI
+        :return: Phase recorder for the request; a no-op one when it is not traced
+        """
+        profiles = tuple(self._profiles)
+        sampled = self.tracer is not None and random.random() < self.trace_sample_rate
+        if not profiles and not sampled:
+            return _NO_TRACE
+
+        def emit(span: Dict) -> None:
+            if sampled:
+                try:
+                    self.tracer(span)
+                except Exception as error:
+                    # A failing tracer or exporter must never break a geocoding call
+                    warnings.warn(f"what3words tracer failed: {error!r}", RuntimeWarning)
+            for profile in profiles:
+                profile.add(span)
+
+        return _RequestTrace(url_path, emit)
+
+    @contextmanager
+    def profile(self, file: Optional[TextIO] = None) -> Iterator["RequestProfile"]:
+        """
+        Context manager timing every request made in its block, whatever the sample rate.
+        A per-phase breakdown is printed when the block exits.
+        :param file: Where to print the breakdown. Defaults to sys.stdout
+        :return: RequestProfile collecting the timings
+        """
+        profile = RequestProfile()
+        self._profiles.append(profile)
+        try:
+            yield profile
+        finally:
+            self._profiles.remove(profile)
+            profile.print_stats(file)
 
     def is_possible_3wa(self, text: str) -> bool:
         """
@@ -211,8 +627,7 @@ class Geocoder:
         :param text: Text to check
         :return: True if possible 3 word address, False otherwise
         """
-        regex_match = r"^\/*(?:[^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}|[<.,>?\/\";:£§º©®\s]+[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+|[^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+([\u0020\u00A0][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+){1,3}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+([\u0020\u00A0][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+){1,3}[.｡。･・︒។։။۔።।][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+([\u0020\u00A0][^0-9`~!@#$%^&*()+\-_=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]+){1,3})$"
-        return re.match(regex_match, text) is not None
+        return _POSSIBLE_3WA_PATTERN.match(text) is not None
 
     def find_possible_3wa(self, text: str) -> List[str]:
         """
@@ -220,8 +635,7 @@ class Geocoder:
         :param text: Text to check
         :return: List of possible 3 word addresses
         """
-        regex_search = r"[^\d`~!@#$%^&*()+\-=\[\]{}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^\d`~!@#$%^&*()+\-=\[\]{}\\|'<>.,?\/\";:£§º©®\s]{1,}[.｡。･・︒។։။۔።।][^\d`~!@#$%^&*()+\-=\[\]{}\\|'<>.,?\/\";:£§º©®\s]{1,}"
-        return re.findall(regex_search, text, flags=re.UNICODE)
+        return _FIND_3WA_PATTERN.findall(text)
 
     def did_you_mean(self, text: str) -> bool:
         """
@@ -229,8 +643,70 @@ class Geocoder:
         :param text: Text to check
         :return: True if almost a 3 word address, False otherwise
         """
-        regex_didyoumean = r"^\/?[^0-9`~!@#$%^&*()+\-=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.\uFF61\u3002\uFF65\u30FB\uFE12\u17D4\u0964\u1362\u3002:။^_۔։ ,\\\/+'&\\:;|\u3000-]{1,2}[^0-9`~!@#$%^&*()+\-=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}[.\uFF61\u3002\uFF65\u30FB\uFE12\u17D4\u0964\u1362\u3002:။^_۔։ ,\\\/+'&\\:;|\u3000-]{1,2}[^0-9`~!@#$%^&*()+\-=\[\{\]}\\|'<>.,?\/\";:£§º©®\s]{1,}$"
-        return re.match(regex_didyoumean, text) is not None
+        return _DID_YOU_MEAN_PATTERN.match(text) is not None
+
+    def is_possible_3wa_array(
+        self,
+        texts: Sequence[str],
+        chunk_size: int = REGEX_CHUNK_SIZE,
+        max_workers: int = 1,
+    ) -> Any:
+        """
+        Vectorised is_possible_3wa over a sequence, NumPy array or pandas Series of strings.
+        Non-string entries (None, NaN) are treated as non-matching.
+        :param texts: Texts to check
+        :param chunk_size: Number of texts matched per worker process when max_workers > 1
+        :param max_workers: Number of worker processes. Defaults to 1, matching in the calling
+            process. With more, call from under an ``if __name__ == "__main__":`` guard
+        :return: Boolean mask; a Series (same index) for Series input, a NumPy array for
+            NumPy input, else a list
+        """
+        values = _map_chunks(
+            _match_chunk, _POSSIBLE_3WA_PATTERN, texts, chunk_size, max_workers
+        )
+        return _to_mask(texts, values)
+
+    def find_possible_3wa_array(
+        self,
+        texts: Sequence[str],
+        chunk_size: int = REGEX_CHUNK_SIZE,
+        max_workers: int = 1,
+    ) -> Any:
+        """
+        Vectorised find_possible_3wa over a sequence, NumPy array or pandas Series of strings.
+        Matches are exploded to one entry per possible 3 word address found.
+        :param texts: Texts to search
+        :param chunk_size: Number of texts searched per worker process when max_workers > 1
+        :param max_workers: Number of worker processes. Defaults to 1, matching in the calling
+            process. With more, call from under an ``if __name__ == "__main__":`` guard
+        :return: For Series input, a Series of matches indexed by the source row label.
+            Otherwise a (row positions, matches) tuple, of NumPy arrays for NumPy input, else of lists
+        """
+        matches = _map_chunks(
+            _findall_chunk, _FIND_3WA_PATTERN, texts, chunk_size, max_workers
+        )
+        return _to_exploded(texts, matches)
+
+    def did_you_mean_array(
+        self,
+        texts: Sequence[str],
+        chunk_size: int = REGEX_CHUNK_SIZE,
+        max_workers: int = 1,
+    ) -> Any:
+        """
+        Vectorised did_you_mean over a sequence, NumPy array or pandas Series of strings.
+        Non-string entries (None, NaN) are treated as non-matching.
+        :param texts: Texts to check
+        :param chunk_size: Number of texts matched per worker process when max_workers > 1
+        :param max_workers: Number of worker processes. Defaults to 1, matching in the calling
+            process. With more, call from under an ``if __name__ == "__main__":`` guard
+        :return: Boolean mask; a Series (same index) for Series input, a NumPy array for
+            NumPy input, else a list
+        """
+        values = _map_chunks(
+            _match_chunk, _DID_YOU_MEAN_PATTERN, texts, chunk_size, max_workers
+        )
+        return _to_mask(texts, values)
 
     def is_valid_3wa(self, text: str) -> bool:
         """
@@ -315,3 +791,271 @@ class Circle:
 
     def __repr__(self) -> str:
         return f"Circle({repr(self.center)}, {self.radius})"
+
+
+class ColumnarResults:
+    """
+    Gathers convert_to_3wa responses into columnar buffers filled in fixed-size chunks.
+    Rows that returned an error keep their position, with the error code in the error column.
+    """
+
+    STRING_COLUMNS = ("words", "country", "nearestPlace", "language", "error")
+    FLOAT_COLUMNS = ("lat", "lng", "sw_lat", "sw_lng", "ne_lat", "ne_lng")
+
+    def __init__(
+        self,
+        chunk_size: int = 65536,
+        on_chunk: Optional[Callable[[Any], None]] = None,
+        format: str = "numpy",
+    ):
+        """
+        Constructor
+        :param chunk_size: Number of rows per chunk
+        :param on_chunk: Called with each full chunk, which is then released to bound memory.
+            Without it every chunk is kept for to_numpy/to_arrow
+        :param format: Chunk type passed to on_chunk; can be 'numpy' (default), a dictionary
+            of NumPy arrays, or 'arrow', a pyarrow.RecordBatch
+        """
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+        self.format = format
+        self._chunks = []
+        self._length = 0
+        self._new_chunk()
+
+    def __len__(self) -> int:
+        return self._length
+
+    def append(self, response: Dict, square: Optional["BoundingBox"] = None) -> None:
+        """
+        Appends one convert_to_3wa response as a row
+        :param response: Response as a dictionary
+        :param square: Known bounds of the square, used when the response has none (errors)
+        """
+        columns = self._columns
+        coordinates = response.get("coordinates") or {}
+        if "square" in response:
+            southwest = response["square"]["southwest"]
+            northeast = response["square"]["northeast"]
+        elif square is not None:
+            southwest = {"lat": square.sw.lat, "lng": square.sw.lng}
+            northeast = {"lat": square.ne.lat, "lng": square.ne.lng}
+        else:
+            southwest = northeast = {}
+        error = response.get("error")
+        columns["words"].append(response.get("words"))
+        columns["country"].append(response.get("country"))
+        columns["nearestPlace"].append(response.get("nearestPlace"))
+        columns["language"].append(response.get("language"))
+        columns["error"].append(error["code"] if error else None)
+        columns["lat"].append(coordinates.get("lat", math.nan))
+        columns["lng"].append(coordinates.get("lng", math.nan))
+        columns["sw_lat"].append(southwest.get("lat", math.nan))
+        columns["sw_lng"].append(southwest.get("lng", math.nan))
+        columns["ne_lat"].append(northeast.get("lat", math.nan))
+        columns["ne_lng"].append(northeast.get("lng", math.nan))
+        self._length += 1
+        if len(columns["words"]) >= self.chunk_size:
+            self._finish_chunk()
+
+    def flush(self) -> None:
+        """
+        Hands the current partial chunk to on_chunk. Call once all rows are appended.
+        """
+        if self.on_chunk is not None and self._columns["words"]:
+            self._finish_chunk()
+
+    def to_numpy(self) -> Dict[str, Any]:
+        """
+        Returns the retained rows as NumPy arrays
+        :return: Dictionary of column name to array; float64 for coordinates, object for strings
+        """
+        chunks = [self._to_numpy(columns) for columns in self._retained()]
+        return {
+            name: np.concatenate([chunk[name] for chunk in chunks])
+            for name in self.STRING_COLUMNS + self.FLOAT_COLUMNS
+        }
+
+    def to_arrow(self) -> "pa.Table":
+        """
+        Returns the retained rows as an Arrow table
+        :return: pyarrow.Table with one record batch per chunk
+        """
+        batches = [self._to_arrow(columns) for columns in self._retained()]
+        return pa.Table.from_batches(batches, schema=self.arrow_schema())
+
+    def arrow_schema(self) -> "pa.Schema":
+        """
+        Returns the Arrow schema of the columns, e.g. to open a pyarrow.parquet.ParquetWriter
+        :return: pyarrow.Schema
+        """
+        if pa is None:
+            raise ImportError("pyarrow is required for Arrow columnar output")
+        return pa.schema(
+            [(name, pa.string()) for name in self.STRING_COLUMNS]
+            + [(name, pa.float64()) for name in self.FLOAT_COLUMNS]
+        )
+
+    def _new_chunk(self) -> None:
+        self._columns = {name: [] for name in self.STRING_COLUMNS}
+        self._columns.update({name: array("d") for name in self.FLOAT_COLUMNS})
+
+    def _finish_chunk(self) -> None:
+        if self.on_chunk is None:
+            self._chunks.append(self._columns)
+        elif self.format == "arrow":
+            self.on_chunk(self._to_arrow(self._columns))
+        else:
+            self.on_chunk(self._to_numpy(self._columns))
+        self._new_chunk()
+
+    def _retained(self) -> List[Dict]:
+        # Copy the float buffers of the chunk still being filled: exporting them
+        # would stop the underlying arrays from growing
+        current = dict(self._columns)
+        current.update({name: array("d", current[name]) for name in self.FLOAT_COLUMNS})
+        return self._chunks + [current]
+
+    def _to_numpy(self, columns: Dict) -> Dict[str, Any]:
+        if np is None:
+            raise ImportError("numpy is required for NumPy columnar output")
+        arrays = {
+            name: np.array(columns[name], dtype=object) for name in self.STRING_COLUMNS
+        }
+        arrays.update(
+            {
+                name: np.frombuffer(columns[name], dtype=np.float64)
+                for name in self.FLOAT_COLUMNS
+            }
+        )
+        return arrays
+
+    def _to_arrow(self, columns: Dict) -> "pa.RecordBatch":
+        if pa is None:
+            raise ImportError("pyarrow is required for Arrow columnar output")
+        arrays = [
+            pa.array(columns[name], type=pa.string()) for name in self.STRING_COLUMNS
+        ]
+        arrays += [
+            pa.Array.from_buffers(
+                pa.float64(), len(columns[name]), [None, pa.py_buffer(columns[name])]
+            )
+            for name in self.FLOAT_COLUMNS
+        ]
+        return pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema())
+
+
+class _RequestTrace:
+    """
+    Records the phases of one traced request and emits them as spans when it ends.
+    Timestamps are anchored to one wall clock reading; durations use a monotonic clock.
+    """
+
+    def __init__(self, url_path: str, emit: Callable[[Dict], None]):
+        self._emit = emit
+        self._attributes = {"w3w.endpoint": url_path}
+        self._start_unix_nano = time.time_ns()
+        self._marks = [("prepare_request", time.perf_counter_ns())]
+
+    def mark(self, phase: str) -> None:
+        self._marks.append((phase, time.perf_counter_ns()))
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._attributes[key] = value
+
+    def end(self) -> None:
+        end = time.perf_counter_ns()
+        origin = self._marks[0][1]
+        trace_id = os.urandom(16).hex()
+        root_id = os.urandom(8).hex()
+
+        def span(name: str, start: int, stop: int, parent_id: Optional[str]) -> Dict:
+            return {
+                "name": f"what3words.{name}",
+                "trace_id": trace_id,
+                "span_id": root_id if parent_id is None else os.urandom(8).hex(),
+                "parent_span_id": parent_id,
+                "start_time_unix_nano": self._start_unix_nano + start - origin,
+                "end_time_unix_nano": self._start_unix_nano + stop - origin,
+                "attributes": self._attributes if parent_id is None else {},
+            }
+
+        stops = [start for _, start in self._marks[1:]] + [end]
+        for (phase, start), stop in zip(self._marks, stops):
+            self._emit(span(phase, start, stop, root_id))
+        self._emit(span("request", origin, end, None))
+
+
+class _NoTrace:
+    """
+    Stands in for _RequestTrace when a request is not traced.
+    """
+
+    def mark(self, phase: str) -> None:
+        pass
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+_NO_TRACE = _NoTrace()
+
+
+class RequestProfile:
+    """
+    Accumulates request span timings per phase, as collected by Geocoder.profile.
+    """
+
+    PHASES = ("prepare_request", "http", "read_body", "decode_json", "request")
+
+    def __init__(self):
+        """
+        Constructor
+        """
+        self._lock = threading.Lock()
+        self._calls = dict.fromkeys(self.PHASES, 0)
+        self._nanos = dict.fromkeys(self.PHASES, 0)
+
+    def add(self, span: Dict) -> None:
+        """
+        Records a finished span
+        :param span: Span dictionary emitted by the Geocoder
+        """
+        phase = span["name"].split(".", 1)[1]
+        duration = span["end_time_unix_nano"] - span["start_time_unix_nano"]
+        with self._lock:
+            self._calls[phase] += 1
+            self._nanos[phase] += duration
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Returns the breakdown per phase
+        :return: Dictionary of phase to its number of calls and total and mean time in milliseconds
+        """
+        with self._lock:
+            return {
+                phase: {
+                    "calls": self._calls[phase],
+                    "total_ms": self._nanos[phase] / 1e6,
+                    "mean_ms": self._nanos[phase] / 1e6 / (self._calls[phase] or 1),
+                }
+                for phase in self.PHASES
+            }
+
+    def print_stats(self, file: Optional[TextIO] = None) -> None:
+        """
+        Prints the breakdown per phase, with each phase's share of the total request time
+        :param file: Where to print. Defaults to sys.stdout
+        """
+        stats = self.stats()
+        total = stats["request"]["total_ms"] or 1
+        lines = [f"{'phase':<16}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'%':>8}"]
+        for phase, phase_stats in stats.items():
+            lines.append(
+                f"{phase:<16}{phase_stats['calls']:>8}{phase_stats['total_ms']:>12.2f}"
+                f"{phase_stats['mean_ms']:>10.2f}{100 * phase_stats['total_ms'] / total:>8.1f}"
+            )
+        print("\n".join(lines), file=file or sys.stdout)